@@ -0,0 +1,51 @@
+from flask import has_app_context
+from flask_caching import Cache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+cache = Cache()
+
+def init_cache(app):
+    # Commits drop keys only in the backend they reach, so multi-worker deployments need a
+    # shared store; SimpleCache is per-process and only suits a single development server
+    if app.config.get('REDIS_URL'):
+        app.config.setdefault('CACHE_TYPE', 'RedisCache')
+        app.config.setdefault('CACHE_REDIS_URL', app.config['REDIS_URL'])
+    else:
+        app.config.setdefault('CACHE_TYPE', 'SimpleCache')
+    cache.init_app(app)
+
+
+# (cache key, model classes) pairs registered with drop_on_change
+_watched = []
+
+def drop_on_change(key, *models):
+    """Delete `key` from the cache after any commit that writes one of `models`."""
+    _watched.append((key, models))
+
+def _mark_stale(session, cls):
+    stale = session.info.setdefault("stale_cache_keys", set())
+    stale.update(key for key, models in _watched if issubclass(cls, models))
+
+@event.listens_for(Session, "after_flush")
+def _flag_flushed_changes(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        _mark_stale(session, type(obj))
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_bulk_changes(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and orm_execute_state.bind_mapper:
+        _mark_stale(orm_execute_state.session, orm_execute_state.bind_mapper.class_)
+
+@event.listens_for(Session, "after_commit")
+def _drop_stale_keys(session):
+    stale = session.info.pop("stale_cache_keys", None)
+    if stale and has_app_context():
+        # Not delete_many: Flask-Caching stops at the first key that is not cached
+        for key in stale:
+            cache.delete(key)
+
+@event.listens_for(Session, "after_rollback")
+def _clear_stale_keys(session):
+    session.info.pop("stale_cache_keys", None)
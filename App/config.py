@@ -7,7 +7,6 @@ def load_config(app, overrides):
         app.config.from_object('App.default_config')
     app.config.from_prefixed_env()
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    app.config['TEMPLATES_AUTO_RELOAD'] = True
     app.config['PREFERRED_URL_SCHEME'] = 'https'
     app.config['UPLOADED_PHOTOS_DEST'] = "App/uploads"
     app.config['JWT_ACCESS_COOKIE_NAME'] = 'access_token'
@@ -16,4 +15,11 @@ def load_config(app, overrides):
     app.config["JWT_COOKIE_CSRF_PROTECT"] = False
     app.config['FLASK_ADMIN_SWATCH'] = 'darkly'
     for key in overrides:
-        app.config[key] = overrides[key]
\ No newline at end of file
+        app.config[key] = overrides[key]
+    if str(app.config.get('SQLALCHEMY_DATABASE_URI', '')).startswith('postgres'):
+        engine_options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+        engine_options.setdefault('pool_size', 9)
+        engine_options.setdefault('max_overflow', 4)
+        engine_options.setdefault('pool_pre_ping', True)
+        engine_options.setdefault('pool_recycle', 1800)
+        engine_options.setdefault('pool_timeout', 5)
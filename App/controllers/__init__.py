@@ -3,4 +3,5 @@ from .auth import *
 from .initialize import *
 from .admin import *
 from .staff import *
+from .report import *
 from .schedule_controller import ScheduleController
@@ -2,7 +2,9 @@ from App.models import Shift, Schedule, Staff, ShiftSwapRequest
 from App.database import db
 from datetime import datetime, timedelta
 from App.controllers.user import get_user
+from App.cache import cache, drop_on_change
 from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 
 def create_schedule(admin_id, scheduleName):
     new_schedule = Schedule(
@@ -35,7 +37,8 @@ def get_shift_report(admin_id):
     admin = get_user(admin_id)
     if not admin or admin.role != "admin":
         raise PermissionError("Only admin can view shift report")
-    return [shift.get_json() for shift in Shift.query.order_by(Shift.start_time).all()]
+    shifts = Shift.query.options(selectinload(Shift.staff)).order_by(Shift.start_time).all()
+    return [shift.get_json() for shift in shifts]
 
 def get_total_staff_count():
     """Count total number of staff members."""
@@ -54,18 +57,20 @@ def get_shifts_this_week():
 
 def get_pending_swap_requests():
     """Get all pending shift swap requests."""
-    requests = ShiftSwapRequest.query.filter_by(status="pending").all()
+    requests = ShiftSwapRequest.query.options(
+        selectinload(ShiftSwapRequest.requesting_staff),
+        selectinload(ShiftSwapRequest.requested_staff),
+        selectinload(ShiftSwapRequest.shift),
+    ).filter_by(status="pending").all()
     return [req.get_json() for req in requests]
 
 def get_staff_attendance():
     """Get attendance data for all staff (with clock in/out times and hours)."""
-    staff_members = Staff.query.all()
+    staff_members = Staff.query.options(selectinload(Staff.shifts)).all()
     attendance_data = []
     
     for staff in staff_members:
-        shifts = Shift.query.filter_by(staff_id=staff.id).all()
-        
-        for shift in shifts:
+        for shift in staff.shifts:
             hours = 0
             status = "Absent"
             
@@ -88,6 +93,25 @@ def get_staff_attendance():
     
     return attendance_data
 
+DASHBOARD_STATS_KEY = "dash_stats"
+
+def get_dashboard_stats():
+    """Aggregates for the admin dashboard, cached for 30 seconds."""
+    stats = cache.get(DASHBOARD_STATS_KEY)
+    if stats is None:
+        pending_requests = get_pending_swap_requests()
+        stats = {
+            "total_staff": get_total_staff_count(),
+            "shifts_this_week": get_shifts_this_week(),
+            "pending_requests_count": len(pending_requests),
+            "pending_requests": pending_requests,
+            "attendance": get_staff_attendance(),
+        }
+        cache.set(DASHBOARD_STATS_KEY, stats, timeout=30)
+    return stats
+
+drop_on_change(DASHBOARD_STATS_KEY, Staff, Shift, ShiftSwapRequest)
+
 def approve_swap_request(request_id):
     """Approve a shift swap request."""
     swap_req = db.session.get(ShiftSwapRequest, request_id)
@@ -1,17 +1,27 @@
+from werkzeug.security import check_password_hash, generate_password_hash
 from App.models import User
 from App.database import db
 
-def login(username, password):
+# Checked against when the username is unknown, so a missing user costs the same
+# hash computation as a wrong password and response time does not reveal which it was
+_DUMMY_HASH = generate_password_hash("not-a-real-password")
+
+def _authenticate(username, password):
     result = db.session.execute(db.select(User).filter_by(username=username))
     user = result.scalar_one_or_none()
-    if user and user.check_password(password):
-        return user  # Return user object directly, no JWT
+    if user is None:
+        check_password_hash(_DUMMY_HASH, password)
+        return None
+    if user.check_password(password):
+        return user
     return None
 
+def login(username, password):
+    return _authenticate(username, password)  # Return user object directly, no JWT
+
 def loginCLI(username, password):
-    result = db.session.execute(db.select(User).filter_by(username=username))
-    user = result.scalar_one_or_none()
-    if user and user.check_password(password):
+    user = _authenticate(username, password)
+    if user:
         return {"message": "Login successful", "user_id": user.id}
     return {"message": "Invalid username or password"}
 
@@ -0,0 +1,90 @@
+from datetime import datetime
+from io import BytesIO
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+
+# Shift report PDF styles, built once rather than on every export
+_REPORT_STYLES = getSampleStyleSheet()
+_REPORT_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_REPORT_STYLES['Heading1'],
+    fontSize=18,
+    textColor=colors.HexColor('#1a2332'),
+    spaceAfter=6,
+)
+_REPORT_BODY_STYLE = ParagraphStyle(
+    'CustomBody',
+    parent=_REPORT_STYLES['BodyText'],
+    fontSize=10,
+    textColor=colors.HexColor('#333333'),
+)
+_REPORT_HEADER = ['Date', 'Start', 'End', 'Scheduled Hrs', 'Clock In', 'Clock Out', 'Actual Hrs', 'Attended']
+_REPORT_COL_WIDTHS = [0.9*inch, 0.75*inch, 0.75*inch, 0.85*inch, 0.75*inch, 0.75*inch, 0.75*inch, 0.7*inch]
+_REPORT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a2332')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cccccc')),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
+])
+
+
+def build_weekly_report_pdf(report_data):
+    """Render a weekly staff report (as returned by get_staff_weekly_report) to a PDF buffer.
+
+    Takes plain report data rather than a request, so it can also run outside a view.
+    """
+    pdf_buffer = BytesIO()
+    doc = SimpleDocTemplate(pdf_buffer, pagesize=letter)
+    elements = []
+
+    # Title
+    title = Paragraph(f"Weekly Shift Report - {report_data['staff_name']}", _REPORT_TITLE_STYLE)
+    elements.append(title)
+
+    # Summary info
+    summary_text = f"""
+    <br/><b>Period:</b> {report_data['week_start']} to {report_data['week_end']}<br/>
+    <b>Total Shifts:</b> {report_data['total_shifts']}<br/>
+    <b>Attended Shifts:</b> {report_data['attended_shifts']}<br/>
+    <b>Attendance Rate:</b> {report_data['attendance_percentage']}%<br/>
+    <b>Scheduled Hours:</b> {report_data['total_scheduled_hours']}<br/>
+    <b>Actual Hours:</b> {report_data['total_actual_hours']}<br/>
+    <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}<br/>
+    """
+    elements.append(Paragraph(summary_text, _REPORT_BODY_STYLE))
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Shifts table
+    table_data = [_REPORT_HEADER] + [
+        [
+            shift['date'],
+            shift['start_time'],
+            shift['end_time'],
+            str(shift['scheduled_hours']),
+            shift['clock_in'],
+            shift['clock_out'],
+            str(shift['actual_hours']),
+            shift['attended']
+        ]
+        for shift in report_data['shifts']
+    ]
+
+    # repeatRows keeps the header on every page of a long report
+    table = Table(table_data, colWidths=_REPORT_COL_WIDTHS, repeatRows=1)
+    table.setStyle(_REPORT_TABLE_STYLE)
+    elements.append(table)
+
+    # Build PDF
+    doc.build(elements)
+    pdf_buffer.seek(0)
+    return pdf_buffer
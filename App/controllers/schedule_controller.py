@@ -45,52 +45,55 @@ class ScheduleController:
 
         return shift.get_json(), 200
 
+    @staticmethod
+    def _get_shifts_by_staff(staff_ids: List[int]) -> Dict[int, List[Shift]]:
+        """Existing shifts for each known staff id, loaded in two queries."""
+        known_ids = {
+            row[0] for row in db.session.query(Staff.id).filter(Staff.id.in_(staff_ids))
+        }
+        shifts_by_staff = {staff_id: [] for staff_id in staff_ids if staff_id in known_ids}
+        if known_ids:
+            for shift in Shift.query.filter(Shift.staff_id.in_(known_ids)):
+                shifts_by_staff[shift.staff_id].append(shift)
+        return shifts_by_staff
+
     @staticmethod
     def _get_staff_stats(staff_ids: List[int]) -> Dict[int, Dict[str, float]]:
         stats = {}
-        for staff_id in staff_ids:
-            staff = Staff.query.get(staff_id)
-            if staff:
-                shifts = Shift.query.filter_by(staff_id=staff_id).all()
-                shifts_assigned = len(shifts)
-                hours_assigned = sum([shift.calculate_shift_duration_hours() for shift in shifts])
-                stats[staff_id] = {"shifts_assigned": shifts_assigned, "hours_assigned": hours_assigned}
+        for staff_id, shifts in ScheduleController._get_shifts_by_staff(staff_ids).items():
+            shifts_assigned = len(shifts)
+            hours_assigned = sum([shift.calculate_shift_duration_hours() for shift in shifts])
+            stats[staff_id] = {"shifts_assigned": shifts_assigned, "hours_assigned": hours_assigned}
         return stats
 
     @staticmethod
     def _get_days_worked(staff_ids: List[int]) -> Dict[int, set]:
         days_worked = {}
-        for staff_id in staff_ids:
-            staff = Staff.query.get(staff_id)
-            if staff:
-                shifts = Shift.query.filter_by(staff_id=staff_id).all()
-                worked_days = {shift.start_time.strftime("%Y-%m-%d") for shift in shifts}
-                days_worked[staff_id] = worked_days
+        for staff_id, shifts in ScheduleController._get_shifts_by_staff(staff_ids).items():
+            worked_days = {shift.start_time.strftime("%Y-%m-%d") for shift in shifts}
+            days_worked[staff_id] = worked_days
         return days_worked
 
     @staticmethod
     def _get_day_night_stats(staff_ids: List[int], day_shift_hours: Tuple[int, int] = (6, 18)) -> Dict[int, Dict[str, Any]]:
         stats = {}
-        for staff_id in staff_ids:
-            staff = Staff.query.get(staff_id)
-            if staff:
-                shifts = Shift.query.filter_by(staff_id=staff_id).all()
-                day_count = 0
-                night_count = 0
-                total_hours = 0
-                for shift in shifts:
-                    is_day_shift = BalancedDayNightStrategy.is_day_shift(shift.start_time, day_shift_hours)
-                    if is_day_shift:
-                        day_count += 1
-                    else:
-                        night_count += 1
-                    total_hours += shift.calculate_shift_duration_hours()
+        for staff_id, shifts in ScheduleController._get_shifts_by_staff(staff_ids).items():
+            day_count = 0
+            night_count = 0
+            total_hours = 0
+            for shift in shifts:
+                is_day_shift = BalancedDayNightStrategy.is_day_shift(shift.start_time, day_shift_hours)
+                if is_day_shift:
+                    day_count += 1
+                else:
+                    night_count += 1
+                total_hours += shift.calculate_shift_duration_hours()
 
-                stats[staff_id] = {
-                    "day_count": day_count,
-                    "night_count": night_count,
-                    "total_hours": total_hours
-                }
+            stats[staff_id] = {
+                "day_count": day_count,
+                "night_count": night_count,
+                "total_hours": total_hours
+            }
         return stats
 
     @staticmethod
@@ -114,34 +117,46 @@ class ScheduleController:
         
         if strategy_type == 'even':
             strategy = EvenDistributionStrategy(eligible_staff_ids)
+            stats = ScheduleController._get_staff_stats(eligible_staff_ids)
         elif strategy_type == 'min_days':
             strategy = MinDaysPerWeekStrategy(eligible_staff_ids)
+            stats = ScheduleController._get_days_worked(eligible_staff_ids)
         else:
             strategy = BalancedDayNightStrategy(eligible_staff_ids)
+            stats = ScheduleController._get_day_night_stats(eligible_staff_ids, day_shift_hours)
 
-        result_shifts = []
+        # Stats are loaded once and kept current in memory as shifts are
+        # assigned, so the whole schedule is inserted with a single flush.
+        shifts = []
         current_datetime = base_date if base_date else datetime.utcnow()
         
         for day_offset in range(num_days):
             start_time = current_datetime + timedelta(days=day_offset, hours=shift_start_hour)
             end_time = current_datetime + timedelta(days=day_offset, hours=shift_end_hour)
+            hours = (end_time - start_time).total_seconds() / 3600.0
 
             if strategy_type == 'even':
-                stats = ScheduleController._get_staff_stats(eligible_staff_ids)
                 best_staff_id = strategy.score_staff(stats)
+                if best_staff_id in stats:
+                    stats[best_staff_id]["shifts_assigned"] += 1
+                    stats[best_staff_id]["hours_assigned"] += hours
             elif strategy_type == 'min_days':
-                stats = ScheduleController._get_days_worked(eligible_staff_ids)
                 target_day = start_time.strftime("%Y-%m-%d")
                 best_staff_id = strategy.score_staff(stats, target_day)
+                if best_staff_id in stats:
+                    stats[best_staff_id].add(target_day)
             else:
-                stats = ScheduleController._get_day_night_stats(eligible_staff_ids, day_shift_hours)
                 is_day_shift = BalancedDayNightStrategy.is_day_shift(start_time, day_shift_hours)
                 best_staff_id = strategy.score_staff(stats, is_day_shift)
+                if best_staff_id in stats:
+                    stats[best_staff_id]["day_count" if is_day_shift else "night_count"] += 1
+                    stats[best_staff_id]["total_hours"] += hours
 
-            shift = Shift(staff_id=best_staff_id, start_time=start_time, end_time=end_time, schedule_id=schedule_id)
-            db.session.add(shift)
-            db.session.commit()
-            result_shifts.append(shift.get_json())
+            shifts.append(Shift(staff_id=best_staff_id, start_time=start_time, end_time=end_time, schedule_id=schedule_id))
+
+        db.session.add_all(shifts)
+        db.session.commit()
+        result_shifts = [shift.get_json() for shift in shifts]
 
         return {"shifts": result_shifts, "count": len(result_shifts)}, 201
 
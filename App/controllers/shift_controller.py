@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import Dict, Any, Tuple
 
+from sqlalchemy import and_, case, func
+
 from App.database import db
 from App.models import Staff, Shift
 
@@ -57,6 +59,24 @@ class ShiftController:
 
         return {"shifts": shifts_json, "count": len(shifts_json)}, 200
 
+    @staticmethod
+    def get_shift_summary(staff_id: int, *criteria) -> Dict[str, Any]:
+        # Total, completed count and worked hours in a single aggregate query;
+        # extra criteria (e.g. a listing's filter) narrow the shifts summarised
+        completed = and_(Shift.clock_in.isnot(None), Shift.clock_out.isnot(None))
+        total, completed_count, worked_seconds = db.session.query(
+            func.count(Shift.id),
+            func.count(case((completed, 1))),
+            func.coalesce(func.sum(case((completed, Shift.worked_seconds))), 0)
+        ).filter(Shift.staff_id == staff_id, *criteria).one()
+
+        return {
+            "total_shifts": total,
+            "completed_shifts": completed_count,
+            "total_hours": worked_seconds / 3600,
+            "completion_rate": completed_count / total * 100 if total else 0
+        }
+
     @staticmethod
     def update_shift(
         shift_id: int,
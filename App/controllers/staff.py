@@ -1,14 +1,46 @@
-from App.models import Shift
-from App.database import db
+from App.models import Shift, Staff, ShiftSwapRequest
+from App.database import db, retry_on_conflict
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+from App.cache import cache, drop_on_change
+from App.json_provider import OrjsonProvider
 from datetime import datetime
+import orjson
 from App.controllers.user import get_user
 
-def get_combined_roster(staff_id):
+ROSTER_CACHE_KEY = "roster"
+ROSTER_JSON_CACHE_KEY = "roster_json"
+
+def _check_roster_access(staff_id):
     staff = get_user(staff_id)
     if not staff or staff.role != "staff":
         raise PermissionError("Only staff can view roster")
-    return [shift.get_json() for shift in Shift.query.order_by(Shift.start_time).all()]
 
+def _load_roster():
+    # The combined roster is the same for every staff member, so one entry serves all
+    roster = cache.get(ROSTER_CACHE_KEY)
+    if roster is None:
+        shifts = Shift.query.options(selectinload(Shift.staff)).order_by(Shift.start_time).all()
+        roster = [shift.get_json() for shift in shifts]
+        cache.set(ROSTER_CACHE_KEY, roster, timeout=120)
+    return roster
+
+def get_combined_roster(staff_id):
+    _check_roster_access(staff_id)
+    return _load_roster()
+
+def get_combined_roster_json(staff_id):
+    """The combined roster already encoded as JSON bytes, so repeat hits skip serialization."""
+    _check_roster_access(staff_id)
+    body = cache.get(ROSTER_JSON_CACHE_KEY)
+    if body is None:
+        body = orjson.dumps(_load_roster(), option=OrjsonProvider.option)
+        cache.set(ROSTER_JSON_CACHE_KEY, body, timeout=120)
+    return body
+
+# Shift rows and staff usernames both appear in the roster
+drop_on_change(ROSTER_CACHE_KEY, Shift, Staff)
+drop_on_change(ROSTER_JSON_CACHE_KEY, Shift, Staff)
 
 def clock_in(staff_id, shift_id):
     shift = db.session.get(Shift, shift_id)
@@ -37,4 +69,39 @@ def clock_out(staff_id, shift_id):
 
 def get_shift(shift_id):
     shift = db.session.get(Shift, shift_id)
-    return shift
\ No newline at end of file
+    return shift
+
+
+@retry_on_conflict()
+def respond_to_swap(staff_id, request_id, accept):
+    """Accept or decline a pending swap request addressed to staff_id.
+
+    The status change only matches a pending request for this staff member, so two
+    concurrent responses cannot both win. Returns None if the request does not exist.
+    """
+    result = db.session.execute(
+        update(ShiftSwapRequest)
+        .where(ShiftSwapRequest.id == request_id,
+               ShiftSwapRequest.requested_staff_id == staff_id,
+               ShiftSwapRequest.status == "pending")
+        .values(status="approved" if accept else "denied")
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.session.rollback()
+        swap_request = db.session.get(ShiftSwapRequest, request_id)
+        if not swap_request:
+            return None
+        if swap_request.requested_staff_id != staff_id:
+            raise PermissionError("Not authorized to respond to this request")
+        raise ValueError("Request already processed")
+    if accept:
+        shift_id = select(ShiftSwapRequest.shift_id).where(ShiftSwapRequest.id == request_id).scalar_subquery()
+        db.session.execute(
+            update(Shift)
+            .where(Shift.id == shift_id)
+            .values(staff_id=staff_id)
+            .execution_options(synchronize_session=False)
+        )
+    db.session.commit()
+    return db.session.get(ShiftSwapRequest, request_id)
@@ -1,5 +1,6 @@
 from App.models import User, Admin, Staff, Shift
 from App.database import db
+from App.cache import cache, drop_on_change
 from datetime import datetime
 
 VALID_ROLES = {"user", "staff", "admin"}
@@ -29,6 +30,19 @@ def get_user(id):
 def get_all_users():
     return User.query.all()
 
+STAFF_CHOICES_KEY = "staff_choices"
+
+def get_staff_choices():
+    """Id/username pairs for staff dropdowns; the staff list changes rarely."""
+    choices = cache.get(STAFF_CHOICES_KEY)
+    if choices is None:
+        choices = [{"id": id, "username": username}
+                   for id, username in db.session.query(Staff.id, Staff.username).order_by(Staff.id)]
+        cache.set(STAFF_CHOICES_KEY, choices, timeout=60)
+    return choices
+
+drop_on_change(STAFF_CHOICES_KEY, Staff)
+
 def get_all_users_json():
     users = get_all_users()
     if not users:
@@ -1,5 +1,12 @@
+import time
+from functools import wraps
+
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import Float
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 
 
 db = SQLAlchemy()
@@ -11,4 +18,41 @@ def create_db():
     db.create_all()
     
 def init_db(app):
-    db.init_app(app)
\ No newline at end of file
+    db.init_app(app)
+
+# Postgres serialization_failure and deadlock_detected; safe to retry from scratch
+RETRYABLE_SQLSTATES = {'40001', '40P01'}
+
+def retry_on_conflict(retries=3, backoff=0.05):
+    """Re-run a write transaction that Postgres aborted with a serialization failure or deadlock."""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            for attempt in range(retries + 1):
+                try:
+                    return f(*args, **kwargs)
+                except OperationalError as e:
+                    sqlstate = getattr(e.orig, 'pgcode', None) or getattr(e.orig, 'sqlstate', None)
+                    db.session.rollback()
+                    if sqlstate not in RETRYABLE_SQLSTATES or attempt == retries:
+                        raise
+                    time.sleep(backoff * 2 ** attempt)
+        return wrapper
+    return decorator
+
+
+class seconds_between(FunctionElement):
+    """SQL expression for the number of seconds from `start` to `end`."""
+    type = Float()
+    name = 'seconds_between'
+    inherit_cache = True
+
+@compiles(seconds_between)
+def _seconds_between(element, compiler, **kw):
+    start, end = element.clauses
+    return "EXTRACT(EPOCH FROM (%s - %s))" % (compiler.process(end, **kw), compiler.process(start, **kw))
+
+@compiles(seconds_between, 'sqlite')
+def _seconds_between_sqlite(element, compiler, **kw):
+    start, end = element.clauses
+    return "((julianday(%s) - julianday(%s)) * 86400.0)" % (compiler.process(end, **kw), compiler.process(start, **kw))
@@ -0,0 +1,37 @@
+import json
+
+import orjson
+from flask.json.provider import JSONProvider
+
+
+def _default(o):
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, used by jsonify() and request.get_json()."""
+
+    # Keep the key ordering of Flask's default provider and allow non-string keys like json does
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+    # Callers that pass json module options (such as the session serializer's
+    # object_hook) fall back to the stdlib so those options are honoured.
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            kwargs.setdefault("default", _default)
+            return json.dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self.option)
+        return self._app.response_class(body, mimetype="application/json")
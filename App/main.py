@@ -6,7 +6,9 @@ from werkzeug.utils import secure_filename
 from werkzeug.datastructures import  FileStorage
 
 from App.database import init_db
+from App.cache import init_cache
 from App.config import load_config
+from App.json_provider import OrjsonProvider
 
 from App.views import views, setup_admin
 
@@ -15,14 +17,28 @@ def add_views(app):
     for view in views:
         app.register_blueprint(view)
 
+def init_session(app):
+    # Server-side sessions are opt-in (e.g. FLASK_SESSION_TYPE=redis); signed cookies stay the default
+    session_type = app.config.get('SESSION_TYPE')
+    if not session_type:
+        return
+    from flask_session import Session
+    if session_type == 'redis' and 'SESSION_REDIS' not in app.config and app.config.get('REDIS_URL'):
+        import redis
+        app.config['SESSION_REDIS'] = redis.from_url(app.config['REDIS_URL'])
+    Session(app)
+
 def create_app(overrides={}):
     app = Flask(__name__, static_url_path='/static')
+    app.json = OrjsonProvider(app)
     load_config(app, overrides)
     CORS(app)
     photos = UploadSet('photos', TEXT + DOCUMENTS + IMAGES)
     configure_uploads(app, photos)
     add_views(app)
     init_db(app)
+    init_cache(app)
+    init_session(app)
     setup_admin(app)
     app.app_context().push()
     return app
\ No newline at end of file
@@ -12,7 +12,7 @@ class Schedule(db.Model):
     staff_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
     admin_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
     # Track how the schedule was generated: 'manual' or 'auto'
-    generation_method = db.Column(db.String(20), default='manual', nullable=False)
+    generation_method = db.Column(db.String(20), default='manual', nullable=False, index=True)
     # If auto-generated, store which strategy was used
     strategy_used = db.Column(db.String(50), nullable=True)
 
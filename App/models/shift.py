@@ -1,7 +1,14 @@
 from datetime import datetime
-from App.database import db
+from sqlalchemy.ext.hybrid import hybrid_property
+from App.database import db, seconds_between
 
 class Shift(db.Model):
+    # Staff views filter on staff_id, the roster on schedule_id; both range/order on start_time
+    __table_args__ = (
+        db.Index("ix_shift_staff_start", "staff_id", "start_time"),
+        db.Index("ix_shift_schedule_start", "schedule_id", "start_time"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     staff_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     schedule_id = db.Column(db.Integer, db.ForeignKey("schedule.id"), nullable=True)
@@ -17,6 +24,17 @@ class Shift(db.Model):
         delta = self.end_time - self.start_time
         return delta.total_seconds() / 3600.0
 
+    @hybrid_property
+    def worked_seconds(self):
+        """Seconds between clock in and clock out, or None if not both recorded."""
+        if self.clock_in is None or self.clock_out is None:
+            return None
+        return (self.clock_out - self.clock_in).total_seconds()
+
+    @worked_seconds.expression
+    def worked_seconds(cls):
+        return seconds_between(cls.clock_in, cls.clock_out)
+
     def get_json(self):
         return {
             "id": self.id,
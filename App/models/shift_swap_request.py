@@ -3,6 +3,12 @@ from App.database import db
 
 
 class ShiftSwapRequest(db.Model):
+    # Staff swap pages list received (pending) and made requests, newest first
+    __table_args__ = (
+        db.Index("ix_swap_requested_status_created", "requested_staff_id", "status", "created_at"),
+        db.Index("ix_swap_requesting_created", "requesting_staff_id", "created_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     requesting_staff_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     requested_staff_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
@@ -1,9 +1,18 @@
 import os, tempfile, pytest, logging, unittest
 from werkzeug.security import check_password_hash, generate_password_hash
+from flask import Flask, current_app, jsonify
 from App.main import create_app
-from App.database import db, create_db
+from App.cache import cache, init_cache
+from App.json_provider import OrjsonProvider
+from App.database import db, create_db, retry_on_conflict
 from datetime import datetime, timedelta
-from App.models import User, Schedule, Shift
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+from App.models import User, Schedule, Shift, ShiftSwapRequest, Staff
+from App.controllers.admin import get_dashboard_stats
+from App.controllers.schedule_controller import ScheduleController
+from App.controllers.shift_controller import ShiftController
+from App.controllers.staff import ROSTER_CACHE_KEY, get_combined_roster_json, respond_to_swap
 from App.controllers import (
     create_user,
     get_all_users_json,
@@ -15,7 +24,8 @@ from App.controllers import (
     get_combined_roster,
     clock_in,
     clock_out,
-    get_shift 
+    get_shift,
+    get_staff_choices
 )
 
 
@@ -58,6 +68,10 @@ class UserUnitTests(unittest.TestCase):
         password = "mypass"
         user = User("bob", password)
         assert user.check_password(password)
+
+    def test_login_cli_unknown_user(self):
+        result = loginCLI("ghost", "ghostpass")
+        assert result == {"message": "Invalid username or password"}
 # Admin unit tests
     def test_schedule_shift_valid(self):
         admin = create_user("admin1", "adminpass", "admin")
@@ -336,6 +350,55 @@ class UserUnitTests(unittest.TestCase):
         found = get_user_by_username("nonexistent")
         assert found is None
 
+    def test_shift_worked_seconds(self):
+        """Test worked seconds match between Python and SQL"""
+        admin = create_user("admin_worked", "adminpass", "admin")
+        staff = create_user("staff_worked", "staffpass", "staff")
+        schedule = Schedule(name="Worked Schedule", created_by=admin.id)
+        db.session.add(schedule)
+        db.session.commit()
+
+        shift = schedule_shift(admin.id, staff.id, schedule.id,
+                               datetime(2025, 11, 25, 8, 0, 0),
+                               datetime(2025, 11, 25, 16, 0, 0))
+        assert shift.worked_seconds is None
+
+        shift.clock_in = datetime(2025, 11, 25, 8, 0, 0)
+        shift.clock_out = datetime(2025, 11, 25, 16, 30, 0)
+        db.session.commit()
+
+        total = db.session.query(func.sum(Shift.worked_seconds)).scalar()
+        assert shift.worked_seconds == 30600
+        assert total == pytest.approx(30600)
+
+    def test_shift_summary(self):
+        admin = create_user("admin_summary", "adminpass", "admin")
+        staff = create_user("staff_summary", "staffpass", "staff")
+        schedule = Schedule(name="Summary Schedule", created_by=admin.id)
+        db.session.add(schedule)
+        db.session.commit()
+
+        done = schedule_shift(admin.id, staff.id, schedule.id,
+                              datetime(2025, 11, 25, 8, 0, 0),
+                              datetime(2025, 11, 25, 16, 0, 0))
+        schedule_shift(admin.id, staff.id, schedule.id,
+                       datetime(2025, 11, 26, 8, 0, 0),
+                       datetime(2025, 11, 26, 16, 0, 0))
+        done.clock_in = datetime(2025, 11, 25, 8, 0, 0)
+        done.clock_out = datetime(2025, 11, 25, 14, 0, 0)
+        db.session.commit()
+
+        summary = ShiftController.get_shift_summary(staff.id)
+        assert summary["total_shifts"] == 2
+        assert summary["completed_shifts"] == 1
+        assert summary["total_hours"] == pytest.approx(6)
+        assert summary["completion_rate"] == 50
+
+        completed = ShiftController.get_shift_summary(staff.id, Shift.clock_out.isnot(None))
+        assert completed["total_shifts"] == 1
+        assert completed["total_hours"] == pytest.approx(6)
+        assert completed["completion_rate"] == 100
+
 '''
     Integration Tests
 '''
@@ -344,6 +407,8 @@ def clean_db():
     db.drop_all()
     create_db()
     db.session.remove()
+    # Rebuilding the schema fires no commit events, so cached rows from the last test would survive
+    cache.clear()
     yield
 # This fixture creates an empty database for the test and deletes it after the test
 # scope="class" would execute the fixture once and resued for all methods in the class
@@ -352,6 +417,7 @@ def empty_db():
     app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test.db'})
     create_db()
     db.session.remove()
+    cache.clear()
     yield app.test_client()
     db.drop_all()
 
@@ -360,6 +426,12 @@ def test_authenticate():
     user = User("bob", "bobpass","user")
     assert loginCLI("bob", "bobpass") != None
 
+def test_jsonify_uses_orjson():
+    assert isinstance(current_app.json, OrjsonProvider)
+    response = jsonify({"b": 1, "a": [1, 2], 3: None})
+    assert response.mimetype == "application/json"
+    assert response.get_data() == b'{"3":null,"a":[1,2],"b":1}'
+
 class UsersIntegrationTests(unittest.TestCase):
 
     def test_get_all_users_json(self):
@@ -636,4 +708,116 @@ class UsersIntegrationTests(unittest.TestCase):
         self.assertIn("created_by", schedule_json)
         self.assertIn("shift_count", schedule_json)
         self.assertIn("shifts", schedule_json)
-        self.assertEqual(schedule_json["shift_count"], 1)
\ No newline at end of file
+        self.assertEqual(schedule_json["shift_count"], 1)
+
+    def test_dashboard_stats_refresh_after_commit(self):
+        before = get_dashboard_stats()["total_staff"]
+        create_user("dash_staff", "staffpass", "staff")
+        self.assertEqual(get_dashboard_stats()["total_staff"], before + 1)
+
+    def test_staff_choices_refresh_after_any_staff_write(self):
+        before = len(get_staff_choices())
+        db.session.add(Staff(username="choice_staff", password="staffpass"))
+        db.session.commit()
+        self.assertEqual(len(get_staff_choices()), before + 1)
+
+    def test_combined_roster_refreshes_after_clock_in(self):
+        admin = create_user("roster_admin", "adminpass", "admin")
+        staff = create_user("roster_staff", "staffpass", "staff")
+        schedule = Schedule(name="Roster Cache Schedule", created_by=admin.id)
+        db.session.add(schedule)
+        db.session.commit()
+
+        start = datetime.now()
+        shift = schedule_shift(admin.id, staff.id, schedule.id, start, start + timedelta(hours=8))
+        self.assertIsNone(get_combined_roster(staff.id)[0]["clock_in"])
+
+        self.assertIn(b'"clock_in":null', get_combined_roster_json(staff.id))
+
+        clock_in(staff.id, shift.id)
+        self.assertIsNotNone(get_combined_roster(staff.id)[0]["clock_in"])
+        self.assertNotIn(b'"clock_in":null', get_combined_roster_json(staff.id))
+
+    def test_cache_drop_reaches_other_app_instances(self):
+        # Two app instances sharing one cache backend stand in for two gunicorn workers
+        with tempfile.TemporaryDirectory() as cache_dir:
+            worker_a, worker_b = Flask("worker_a"), Flask("worker_b")
+            for worker in (worker_a, worker_b):
+                worker.config.update(SQLALCHEMY_DATABASE_URI=str(db.engine.url),
+                                     CACHE_TYPE="FileSystemCache", CACHE_DIR=cache_dir)
+                db.init_app(worker)
+                init_cache(worker)
+
+            with worker_b.app_context():
+                cache.set(ROSTER_CACHE_KEY, [], timeout=120)
+            with worker_a.app_context():
+                create_user("worker_staff", "staffpass", "staff")
+            with worker_b.app_context():
+                self.assertIsNone(cache.get(ROSTER_CACHE_KEY))
+
+    def test_redis_url_selects_shared_cache(self):
+        app = Flask("redis_worker")
+        app.config["REDIS_URL"] = "redis://localhost:6379/0"
+        init_cache(app)
+        self.assertEqual(app.config["CACHE_TYPE"], "RedisCache")
+        self.assertEqual(app.config["CACHE_REDIS_URL"], "redis://localhost:6379/0")
+
+    def test_auto_populate_even_spreads_shifts(self):
+        admin = create_user("auto_admin", "adminpass", "admin")
+        first = create_user("auto_staff1", "staffpass", "staff")
+        second = create_user("auto_staff2", "staffpass", "staff")
+        schedule = Schedule(name="Auto Schedule", created_by=admin.id)
+        db.session.add(schedule)
+        db.session.commit()
+
+        result, status = ScheduleController.auto_populate_schedule(
+            schedule.id, 'even', [first.id, second.id], num_days=4,
+            base_date=datetime(2025, 12, 1))
+        self.assertEqual(status, 201)
+        self.assertEqual(result["count"], 4)
+        assigned = [s["staff_id"] for s in result["shifts"]]
+        self.assertEqual(assigned.count(first.id), 2)
+        self.assertEqual(assigned.count(second.id), 2)
+
+    def test_respond_to_swap_reassigns_shift_once(self):
+        admin = create_user("swap_admin", "adminpass", "admin")
+        owner = create_user("swap_owner", "staffpass", "staff")
+        cover = create_user("swap_cover", "staffpass", "staff")
+        schedule = Schedule(name="Swap Schedule", created_by=admin.id)
+        db.session.add(schedule)
+        db.session.commit()
+        start = datetime(2025, 12, 2, 8, 0, 0)
+        shift = schedule_shift(admin.id, owner.id, schedule.id, start, start + timedelta(hours=8))
+        swap = ShiftSwapRequest(requesting_staff_id=owner.id, requested_staff_id=cover.id, shift_id=shift.id)
+        db.session.add(swap)
+        db.session.commit()
+
+        with self.assertRaises(PermissionError):
+            respond_to_swap(owner.id, swap.id, True)
+        self.assertEqual(respond_to_swap(cover.id, swap.id, True).status, "approved")
+        self.assertEqual(db.session.get(Shift, shift.id).staff_id, cover.id)
+        with self.assertRaises(ValueError):
+            respond_to_swap(cover.id, swap.id, False)
+        self.assertIsNone(respond_to_swap(cover.id, 9999, True))
+
+    def test_retry_on_conflict_retries_deadlocks_only(self):
+
+        class PgError(Exception):
+            def __init__(self, pgcode):
+                self.pgcode = pgcode
+
+        calls = []
+
+        @retry_on_conflict(backoff=0)
+        def flaky(pgcode):
+            calls.append(pgcode)
+            if len(calls) < 3:
+                raise OperationalError("UPDATE shift", {}, PgError(pgcode))
+            return "done"
+
+        self.assertEqual(flaky("40P01"), "done")
+        self.assertEqual(len(calls), 3)
+        calls.clear()
+        with self.assertRaises(OperationalError):
+            flaky("08006")
+        self.assertEqual(len(calls), 1)
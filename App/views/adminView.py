@@ -10,6 +10,10 @@ from App.database import db
 
 admin_view = Blueprint('admin_view', __name__, template_folder='../templates')
 
+# Parsers bound once for the createShift hot path
+_fromiso = datetime.fromisoformat
+_strptime = datetime.strptime
+
 # Based on the controllers in App/controllers/admin.py, admins can do the following actions:
 # 1. Create Schedule
 # 2. Get Schedule Report
@@ -113,13 +117,12 @@ def createShift():
         startTime = data.get("start_time")
         endTime = data.get("end_time")
         try:
-            start_time = datetime.fromisoformat(startTime)
-            end_time = datetime.fromisoformat(endTime)
+            start_time = _fromiso(startTime)
+            end_time = _fromiso(endTime)
         except ValueError:
-            start_time = datetime.strptime(startTime, "%Y-%m-%d %H:%M:%S")
-            end_time = datetime.strptime(endTime, "%Y-%m-%d %H:%M:%S")
+            start_time = _strptime(startTime, "%Y-%m-%d %H:%M:%S")
+            end_time = _strptime(endTime, "%Y-%m-%d %H:%M:%S")
         shift = admin.schedule_shift(admin_id, staffID, scheduleID, start_time, end_time)
-        print("Debug: Created shift in view:", shift.get_json())
         return jsonify(shift.get_json()), 200
     except (PermissionError, ValueError) as e:
         return jsonify({"error": str(e)}), 403
@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, jsonify, request, flash, send_from_directory, redirect, url_for
+from flask import Blueprint, current_app, render_template, jsonify, request, flash, send_from_directory, redirect, url_for
 # Removed flask_jwt_extended import
 
 from .index import index_views
@@ -9,6 +9,11 @@ from App.controllers import (
 
 auth_views = Blueprint('auth_views', __name__, template_folder='../templates')
 
+# Constant API bodies, serialized once. A fresh Response is still built per request
+# because after_request hooks (e.g. CORS) add headers to the response object.
+_IDENTIFY_BODY = b'{"message":"You are logged in (no auth)"}'
+_LOGOUT_BODY = b'{"message":"Logged Out!"}'
+
 '''
 Page/Action Routes
 '''
@@ -49,8 +54,8 @@ def user_login_api():
 
 @auth_views.route('/api/identify', methods=['GET'])
 def identify_user():
-    return jsonify({'message': "You are logged in (no auth)"})
+    return current_app.response_class(_IDENTIFY_BODY, mimetype='application/json')
 
 @auth_views.route('/api/logout', methods=['GET'])
 def logout_api():
-    return jsonify(message="Logged Out!")
\ No newline at end of file
+    return current_app.response_class(_LOGOUT_BODY, mimetype='application/json')
\ No newline at end of file
@@ -1,26 +1,89 @@
-from flask import Blueprint, redirect, render_template, jsonify, request, url_for, flash, session
-from App.controllers import create_user, initialize, login
+from flask import Blueprint, current_app, make_response, redirect, render_template, send_file, stream_template, jsonify, request, url_for, flash, session
+from App.controllers import admin, build_weekly_report_pdf, create_user, get_staff_choices, initialize, login
+from App.controllers.schedule_controller import ScheduleController
+from App.controllers.shift_controller import ShiftController
+from App.models import Schedule, Shift, ShiftSwapRequest, Staff, User
 from App.database import db
-from functools import wraps
+from datetime import date, datetime, time, timedelta
+import hashlib
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 
 index_views = Blueprint('index_views', __name__, template_folder='../templates')
 
-# Admin-only decorator
-def admin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if 'role' not in session or session['role'] != 'admin':
-            flash('You do not have permission to access this page.', 'error')
-            return redirect(url_for('index_views.staff_dashboard'))
-        return f(*args, **kwargs)
-    return decorated_function
+_ONE_DAY = timedelta(days=1)
+_SEVEN_DAYS = timedelta(days=7)
+
+# Redirect target for the admin guard, resolved on first use
+_staff_dashboard_url = None
+
+# Admin-only guard: runs once per request for every /admin/ page except the login page
+@index_views.before_request
+def admin_guard():
+    # Cheap path test first so non-admin pages never touch the session here
+    if not request.path.startswith('/admin/') or session.get('role') == 'admin':
+        return None
+    if request.endpoint == 'index_views.admin_login':
+        return None
+    global _staff_dashboard_url
+    if _staff_dashboard_url is None:
+        _staff_dashboard_url = url_for('.staff_dashboard')
+    flash('You do not have permission to access this page.', 'error')
+    return redirect(_staff_dashboard_url)
+
+def _form_values(*fields):
+    """Read the given form fields in one pass, stripped of surrounding whitespace."""
+    form = request.form
+    return {field: form.get(field, '').strip() for field in fields}
+
+_template_digests = {}
+
+def _render_cacheable(template):
+    """Render a page whose output only depends on its template and the logged-in user.
+
+    The response carries an ETag so browsers can revalidate with a 304 instead of
+    downloading the page again.
+    """
+    # Pending flash messages are shown once, so those responses must not be cached
+    if '_flashes' in session:
+        return render_template(template)
+
+    digest = _template_digests.get(template)
+    if digest is None:
+        env = current_app.jinja_env
+        source = ''.join(env.loader.get_source(env, name)[0] for name in (template, 'layout.html'))
+        digest = hashlib.md5(source.encode()).hexdigest()
+        if not env.auto_reload:
+            _template_digests[template] = digest
+
+    # layout.html shows who is logged in, so the user is part of the ETag
+    identity = f"{session.get('user_id')}:{session.get('username')}:{session.get('role')}"
+    etag = hashlib.md5(f"{digest}:{identity}".encode()).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(render_template(template))
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
 
 # ---------- Home / Utility ----------
 
+_HEALTH_BODY = b'{"status":"healthy"}'
+# Welcome page as seen by a visitor with an empty session, rendered once
+_anonymous_welcome = None
+
 @index_views.route('/', methods=['GET'])
 def index_page():
     # show welcome page with admin and staff login options
-    return render_template('welcome.html')
+    global _anonymous_welcome
+    if session:
+        # Logged-in users and pending flashes change the layout; render normally
+        return render_template('welcome.html')
+    if _anonymous_welcome is None or current_app.jinja_env.auto_reload:
+        _anonymous_welcome = render_template('welcome.html')
+    return _anonymous_welcome
 
 
 @index_views.route('/init', methods=['GET'])
@@ -31,7 +94,7 @@ def init():
 
 @index_views.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'healthy'})
+    return current_app.response_class(_HEALTH_BODY, mimetype='application/json')
 
 
 # ---------- Staff UI Pages ----------
@@ -39,8 +102,7 @@ def health_check():
 @index_views.route('/staff/login', methods=['GET', 'POST'])
 def staff_login():
     if request.method == 'POST':
-        username = request.form.get('username', '').strip()
-        password = request.form.get('password', '').strip()
+        username, password = _form_values('username', 'password').values()
 
         if not username or not password:
             flash('Please enter both username and password.', 'error')
@@ -58,41 +120,42 @@ def staff_login():
         # Redirect admins to admin dashboard
         if user.role == 'admin':
             flash('Welcome, Administrator!', 'success')
-            return redirect(url_for('index_views.admin_dashboard'))
+            return redirect(url_for('.admin_dashboard'))
         
-        return redirect(url_for('index_views.staff_dashboard'))
+        return redirect(url_for('.staff_dashboard'))
 
     # GET
     return render_template('staff_login.html')
 
 
+# Fields echoed back into the signup form when it is re-rendered
+_SIGNUP_ECHO = ('fullname', 'email', 'phone', 'username')
+
+def _signup_error(message, vals):
+    flash(message, 'error')
+    return render_template('staff_signup.html', **{k: vals[k] for k in _SIGNUP_ECHO})
+
+
 @index_views.route('/staff/signup', methods=['GET', 'POST'])
 def staff_signup():
     if request.method == 'POST':
-        fullname = request.form.get('fullname', '').strip()
-        email = request.form.get('email', '').strip()
-        phone = request.form.get('phone', '').strip()
-        role = request.form.get('role', '').strip()
-        username = request.form.get('username', '').strip()
-        password = request.form.get('password', '').strip()
-        confirm = request.form.get('confirm_password', '').strip()
-
-        if not fullname or not email or not phone or not role or not username or not password:
-            flash('All fields are required.', 'error')
-            return render_template('staff_signup.html', fullname=fullname, email=email, phone=phone, username=username)
+        vals = _form_values('fullname', 'email', 'phone', 'role', 'username', 'password', 'confirm_password')
+        username, password, confirm = vals['username'], vals['password'], vals['confirm_password']
+
+        # confirm_password is checked separately below
+        if not all(vals[k] for k in ('fullname', 'email', 'phone', 'role', 'username', 'password')):
+            return _signup_error('All fields are required.', vals)
 
         if password != confirm:
-            flash('Passwords do not match.', 'error')
-            return render_template('staff_signup.html', fullname=fullname, email=email, phone=phone, username=username)
+            return _signup_error('Passwords do not match.', vals)
 
         try:
             create_user(username, password, 'staff')
         except Exception as e:
-            flash(f'Could not create account: {e}', 'error')
-            return render_template('staff_signup.html', fullname=fullname, email=email, phone=phone, username=username)
+            return _signup_error(f'Could not create account: {e}', vals)
 
         flash('Account created successfully! You can now log in.', 'success')
-        return redirect(url_for('index_views.staff_login'))
+        return redirect(url_for('.staff_login'))
 
     # GET
     return render_template('staff_signup.html')
@@ -102,47 +165,49 @@ def staff_signup():
 def staff_dashboard():
     staff_id = session.get('user_id')
     today_shift = None
-    shifts_week = []
+    shifts_count = 0
     total_hours = 0.0
     
     if staff_id:
-        from App.models import Shift
-        from datetime import datetime, timedelta
+        today = datetime.combine(date.today(), time.min)
+        today_end = today + _ONE_DAY
+        week_end = today + _SEVEN_DAYS
         
-        # Get today's shift
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today + timedelta(days=1)
-        today_shift = Shift.query.filter(
+        # One row: the week's earliest shift, with the week's count and worked
+        # seconds attached as window aggregates (computed before the LIMIT)
+        first = db.session.query(
+            Shift.start_time, Shift.end_time, Shift.clock_in, Shift.clock_out,
+            func.count(Shift.id).over().label('shifts_count'),
+            func.coalesce(func.sum(Shift.worked_seconds).over(), 0).label('worked')
+        ).filter(
             Shift.staff_id == staff_id,
             Shift.start_time >= today,
-            Shift.start_time < today_end
-        ).first()
-        
-        # Get this week's shifts (next 7 days)
-        week_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        week_end = week_start + timedelta(days=7)
-        shifts_week = Shift.query.filter(
-            Shift.staff_id == staff_id,
-            Shift.start_time >= week_start,
             Shift.start_time < week_end
-        ).all()
+        ).order_by(Shift.start_time).first()
         
-        # Calculate total hours
-        for shift in shifts_week:
-            if shift.clock_in and shift.clock_out:
-                hours = (shift.clock_out - shift.clock_in).total_seconds() / 3600
-                total_hours += hours
+        if first:
+            shifts_count = first.shifts_count
+            total_hours = first.worked / 3600
+            # The week window starts today, so its earliest shift is today's if any
+            if first.start_time < today_end:
+                today_shift = first
     
     return render_template('staff_dashboard.html', 
                          today_shift=today_shift,
-                         shifts_count=len(shifts_week),
+                         shifts_count=shifts_count,
                          total_hours=f"{total_hours:.1f}")
 
 
 @index_views.route('/staff/shift-details', methods=['GET'])
 def staff_shift_details():
-    return render_template('shift_details.html')
+    return _render_cacheable('shift_details.html')
+
 
+# Clock form action -> (controller handler, success wording, failure label)
+_CLOCK_ACTIONS = {
+    'clock_in': (ShiftController.clock_in, 'clocked in', 'Clock in'),
+    'clock_out': (ShiftController.clock_out, 'clocked out', 'Clock out'),
+}
 
 @index_views.route('/staff/clock', methods=['GET', 'POST'])
 def staff_clock():
@@ -154,22 +219,16 @@ def staff_clock():
         staff_id = session.get('user_id')
         if not staff_id:
             flash('You must be logged in.', 'error')
-            return redirect(url_for('index_views.staff_login'))
+            return redirect(url_for('.staff_login'))
         
-        if action == 'clock_in':
-            from App.controllers.shift_controller import ShiftController
-            result, status_code = ShiftController.clock_in(staff_id, int(shift_id))
+        entry = _CLOCK_ACTIONS.get(action)
+        if entry:
+            handler, done, label = entry
+            result, status_code = handler(staff_id, int(shift_id))
             if status_code == 200:
-                flash('Successfully clocked in!', 'success')
+                flash(f'Successfully {done}!', 'success')
             else:
-                flash(f"Clock in failed: {result.get('error', 'Unknown error')}", 'error')
-        elif action == 'clock_out':
-            from App.controllers.shift_controller import ShiftController
-            result, status_code = ShiftController.clock_out(staff_id, int(shift_id))
-            if status_code == 200:
-                flash('Successfully clocked out!', 'success')
-            else:
-                flash(f"Clock out failed: {result.get('error', 'Unknown error')}", 'error')
+                flash(f"{label} failed: {result.get('error', 'Unknown error')}", 'error')
         
         return render_template('staff_clock.html')
     
@@ -177,20 +236,25 @@ def staff_clock():
     staff_id = session.get('user_id')
     shift_data = None
     if staff_id:
-        from App.controllers.shift_controller import ShiftController
-        from App.models import Shift
-        # Get the first upcoming shift for this staff member (ordered by start_time ascending)
-        shifts = Shift.query.filter_by(staff_id=staff_id).order_by(Shift.start_time.asc()).first()
-        shift_data = shifts.get_json() if shifts else None
+        # Get the first upcoming shift for this staff member (ordered by start_time ascending),
+        # selecting only the columns the clock page renders
+        row = db.session.query(
+            Shift.id, Shift.start_time, Shift.end_time, Shift.clock_in, Shift.clock_out
+        ).filter_by(staff_id=staff_id).order_by(Shift.start_time.asc()).first()
+        if row:
+            shift_data = {
+                "id": row.id,
+                "start_time": row.start_time.isoformat(),
+                "end_time": row.end_time.isoformat(),
+                "clock_in": row.clock_in.isoformat() if row.clock_in else None,
+                "clock_out": row.clock_out.isoformat() if row.clock_out else None
+            }
     
     return render_template('staff_clock.html', shift=shift_data)
 
 
 @index_views.route('/staff/request-swap', methods=['GET', 'POST'])
 def request_swap():
-    from App.models import Shift, Staff, ShiftSwapRequest
-    from App.database import db
-    
     staff_id = session.get('user_id')
     
     if request.method == 'POST':
@@ -217,14 +281,13 @@ def request_swap():
                 db.session.rollback()
                 flash(f'Could not submit swap request: {e}', 'error')
         
-        return redirect(url_for('index_views.request_swap'))
+        return redirect(url_for('.request_swap'))
 
     # GET - fetch user's shifts and other staff members
     my_shifts = []
     other_staff = []
     
     if staff_id:
-        from datetime import datetime
         # Get upcoming shifts for this staff member
         my_shifts = Shift.query.filter(
             Shift.staff_id == staff_id,
@@ -239,9 +302,6 @@ def request_swap():
 @index_views.route('/staff/schedule', methods=['GET'])
 def staff_schedule():
     """Staff's weekly schedule view."""
-    from App.models import Shift
-    from datetime import datetime, timedelta
-    
     staff_id = session.get('user_id')
     week_start_str = request.args.get('week_start')
     
@@ -260,8 +320,8 @@ def staff_schedule():
     week_end = week_start + timedelta(days=6)
     
     # Get shifts for this week
-    week_start_dt = datetime.combine(week_start, datetime.min.time())
-    week_end_dt = datetime.combine(week_end, datetime.max.time())
+    week_start_dt = datetime.combine(week_start, time.min)
+    week_end_dt = datetime.combine(week_end, time.max)
     
     shifts = []
     if staff_id:
@@ -297,8 +357,8 @@ def staff_schedule():
             })
     
     # Calculate navigation dates
-    prev_week = week_start - timedelta(days=7)
-    next_week = week_start + timedelta(days=7)
+    prev_week = week_start - _SEVEN_DAYS
+    next_week = week_start + _SEVEN_DAYS
     
     return render_template('staff_schedule.html',
                          week_start=week_start.isoformat(),
@@ -318,33 +378,24 @@ def staff_shifts():
     filter_type = request.args.get('filter', 'all')
     
     if staff_id:
-        from App.models import Shift
-        from datetime import datetime
-        
-        # Get all shifts for this staff member
-        query = Shift.query.filter_by(staff_id=staff_id)
+        # Get all shifts for this staff member, only the columns the table renders
+        query = Shift.query.with_entities(
+            Shift.id, Shift.start_time, Shift.end_time, Shift.clock_in, Shift.clock_out
+        ).filter_by(staff_id=staff_id)
         
-        # Apply filter
+        # Apply filter; the summary card covers the same shifts as the listing
         now = datetime.now()
+        criteria = []
         if filter_type == 'upcoming':
-            query = query.filter(Shift.start_time >= now)
+            criteria.append(Shift.start_time >= now)
         elif filter_type == 'completed':
-            query = query.filter(Shift.clock_out.isnot(None))
+            criteria.append(Shift.clock_out.isnot(None))
         
-        all_shifts = query.order_by(Shift.start_time.desc()).all()
+        all_shifts = query.filter(*criteria).order_by(Shift.start_time.desc()).all()
         
-        # Calculate total hours (from completed shifts only)
-        completed_count = 0
-        for shift in all_shifts:
-            if shift.clock_in and shift.clock_out:
-                hours = (shift.clock_out - shift.clock_in).total_seconds() / 3600
-                total_hours += hours
-                completed_count += 1
-        
-        # Calculate completion rate from all shifts
-        total_shifts_count = Shift.query.filter_by(staff_id=staff_id).count()
-        if total_shifts_count > 0:
-            completion_rate = (completed_count / total_shifts_count) * 100
+        summary = ShiftController.get_shift_summary(staff_id, *criteria)
+        total_hours = summary['total_hours']
+        completion_rate = summary['completion_rate']
     
     return render_template('staff_shifts.html', shifts=all_shifts, total_hours=round(total_hours, 2), completion_rate=int(completion_rate))
 
@@ -353,8 +404,7 @@ def staff_shifts():
 @index_views.route('/admin/login', methods=['GET', 'POST'])
 def admin_login():
     if request.method == 'POST':
-        username = request.form.get('username', '').strip()
-        password = request.form.get('password', '').strip()
+        username, password = _form_values('username', 'password').values()
 
         if not username or not password:
             flash('Please enter both username and password.', 'error')
@@ -373,28 +423,16 @@ def admin_login():
         session['username'] = user.username
         session['role'] = user.role
         flash('Welcome, Administrator!', 'success')
-        return redirect(url_for('index_views.admin_dashboard'))
+        return redirect(url_for('.admin_dashboard'))
 
     # GET
-    return render_template('admin_login.html')
+    return _render_cacheable('admin_login.html')
 
 
 @index_views.route('/admin/dashboard', methods=['GET'])
-@admin_required
 def admin_dashboard():
-    from App.controllers import admin
     try:
-        total_staff = admin.get_total_staff_count()
-        shifts_this_week = admin.get_shifts_this_week()
-        pending_requests = admin.get_pending_swap_requests()
-        attendance = admin.get_staff_attendance()
-        
-        return render_template('admin/index.html',
-                             total_staff=total_staff,
-                             shifts_this_week=shifts_this_week,
-                             pending_requests_count=len(pending_requests),
-                             pending_requests=pending_requests,
-                             attendance=attendance)
+        return render_template('admin/index.html', **admin.get_dashboard_stats())
     except Exception as e:
         flash(f'Error loading dashboard: {e}', 'error')
         return render_template('admin/index.html',
@@ -406,29 +444,30 @@ def admin_dashboard():
 
 
 @index_views.route('/admin/users', methods=['GET'])
-@admin_required
 def admin_user_list():
-    from App.models import User
-    users = User.query.all()
-    return render_template('user_list.html', users=users)
+    # The template only renders these three columns
+    users = User.query.with_entities(User.id, User.username, User.role).all()
+    return stream_template('user_list.html', users=users)
+
+
+_SCHEDULE_PICKER_LIMIT = 50
+
+def _recent_schedules(generation_method):
+    return Schedule.query.filter_by(generation_method=generation_method).order_by(
+        Schedule.id.desc()
+    ).limit(_SCHEDULE_PICKER_LIMIT).all()
 
 
 @index_views.route('/admin/roster', methods=['GET'])
-@admin_required
 def admin_roster():
-    from App.models import Shift, Staff, Schedule
-    from datetime import datetime, timedelta
-    import calendar
-    
     # Get schedule filter and week_start from query parameters
     schedule_type = request.args.get('schedule_type', 'auto')  # Default to 'auto'
     selected_schedule_id = request.args.get('schedule_id')
     week_start_str = request.args.get('week_start')
     
-    # Get all schedules and organize by type
-    all_schedules = Schedule.query.all()
-    auto_schedules = [s for s in all_schedules if s.generation_method == 'auto']
-    manual_schedules = [s for s in all_schedules if s.generation_method == 'manual']
+    # Most recent schedules of each type for the picker, one indexed query per type
+    auto_schedules = _recent_schedules('auto')
+    manual_schedules = _recent_schedules('manual')
     
     # Determine which schedule to display
     schedule_to_use = None
@@ -436,14 +475,20 @@ def admin_roster():
     if selected_schedule_id:
         schedule_to_use = Schedule.query.get(selected_schedule_id)
     elif schedule_type == 'auto' and auto_schedules:
-        schedule_to_use = auto_schedules[0]  # Default to first auto schedule
+        schedule_to_use = auto_schedules[0]  # Default to latest auto schedule
     elif schedule_type == 'manual' and manual_schedules:
-        schedule_to_use = manual_schedules[0]  # Default to first manual schedule
+        schedule_to_use = manual_schedules[0]  # Default to latest manual schedule
     elif auto_schedules:
         schedule_to_use = auto_schedules[0]  # Fallback to auto if only auto exists
     elif manual_schedules:
         schedule_to_use = manual_schedules[0]  # Fallback to manual if only manual exists
     
+    # An older selected schedule falls outside the picker limit; list it so the form keeps posting it
+    if schedule_to_use:
+        picker = auto_schedules if schedule_to_use.generation_method == 'auto' else manual_schedules
+        if schedule_to_use not in picker:
+            picker.append(schedule_to_use)
+    
     # Get week_start or use current week
     if week_start_str:
         try:
@@ -459,11 +504,14 @@ def admin_roster():
     week_end = week_start + timedelta(days=6)
     
     # Get shifts for this week (from selected schedule if available)
-    week_start_dt = datetime.combine(week_start, datetime.min.time())
-    week_end_dt = datetime.combine(week_end, datetime.max.time())
+    week_start_dt = datetime.combine(week_start, time.min)
+    week_end_dt = datetime.combine(week_end, time.max)
     
     if schedule_to_use:
-        shifts = Shift.query.filter(
+        # Only the shift columns the roster renders, with the staff name joined in
+        shifts = db.session.query(
+            Shift.id, Shift.staff_id, Shift.start_time, Shift.end_time, Staff.username
+        ).outerjoin(Staff, Staff.id == Shift.staff_id).filter(
             Shift.start_time >= week_start_dt,
             Shift.start_time <= week_end_dt,
             Shift.schedule_id == schedule_to_use.id
@@ -471,34 +519,38 @@ def admin_roster():
     else:
         shifts = []
     
-    # Organize shifts by day of week
+    # Organize shifts by day of week; days[i] is the entry for week_start + i days
     schedule_by_day = {}
+    days = []
     for i in range(7):
         day = week_start + timedelta(days=i)
-        schedule_by_day[day.strftime('%Y-%m-%d')] = {
+        entry = {
             'day_name': day.strftime('%A'),
             'date': day.strftime('%B %d, %Y'),
             'short_date': day.strftime('%m/%d'),
             'shifts': []
         }
+        schedule_by_day[day.isoformat()] = entry
+        days.append(entry)
     
-    # Add shifts to their respective days
+    # Add shifts to their respective days by ordinal offset from Monday
+    base_ord = week_start.toordinal()
     for shift in shifts:
-        day_key = shift.start_time.date().isoformat()
-        if day_key in schedule_by_day:
-            staff = Staff.query.get(shift.staff_id)
-            schedule_by_day[day_key]['shifts'].append({
+        idx = shift.start_time.toordinal() - base_ord
+        if 0 <= idx < 7:
+            start, end = shift.start_time, shift.end_time
+            days[idx]['shifts'].append({
                 'id': shift.id,
                 'staff_id': shift.staff_id,
-                'staff_name': staff.username if staff else f'Staff {shift.staff_id}',
-                'start_time': shift.start_time.strftime('%H:%M'),
-                'end_time': shift.end_time.strftime('%H:%M'),
-                'duration': str((shift.end_time - shift.start_time).total_seconds() / 3600).rstrip('0').rstrip('.')
+                'staff_name': shift.username or f'Staff {shift.staff_id}',
+                'start_time': f'{start.hour:02d}:{start.minute:02d}',
+                'end_time': f'{end.hour:02d}:{end.minute:02d}',
+                'duration': str((end - start).total_seconds() / 3600).rstrip('0').rstrip('.')
             })
     
     # Calculate navigation dates
-    prev_week = week_start - timedelta(days=7)
-    next_week = week_start + timedelta(days=7)
+    prev_week = week_start - _SEVEN_DAYS
+    next_week = week_start + _SEVEN_DAYS
     
     context = {
         'week_start': week_start.isoformat(),
@@ -517,25 +569,12 @@ def admin_roster():
     return render_template('weekly_roster.html', **context)
 
 @index_views.route('/admin/weekly-roster', methods=['GET'])
-@admin_required
 def weekly_roster():
-    return render_template('weekly_roster.html')
+    return _render_cacheable('weekly_roster.html')
 
 
 @index_views.route('/admin/reports', methods=['GET', 'POST'])
-@admin_required
 def shift_report():
-    from App.models import Staff
-    from App.controllers import ScheduleController
-    from datetime import datetime
-    from io import BytesIO
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib import colors
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-    from flask import make_response
-    
     staff_members = Staff.query.all()
     report_data = None
     
@@ -550,80 +589,15 @@ def shift_report():
                 report_data, status_code = ScheduleController.get_staff_weekly_report(int(staff_id), week_start)
                 
                 if generate_pdf:
-                    # Generate PDF
-                    pdf_buffer = BytesIO()
-                    doc = SimpleDocTemplate(pdf_buffer, pagesize=letter)
-                    elements = []
-                    
-                    styles = getSampleStyleSheet()
-                    title_style = ParagraphStyle(
-                        'CustomTitle',
-                        parent=styles['Heading1'],
-                        fontSize=18,
-                        textColor=colors.HexColor('#1a2332'),
-                        spaceAfter=6,
-                    )
-                    
-                    # Title
-                    title = Paragraph(f"Weekly Shift Report - {report_data['staff_name']}", title_style)
-                    elements.append(title)
+                    pdf_buffer = build_weekly_report_pdf(report_data)
                     
-                    # Summary info
-                    summary_style = ParagraphStyle(
-                        'CustomBody',
-                        parent=styles['BodyText'],
-                        fontSize=10,
-                        textColor=colors.HexColor('#333333'),
+                    # Serve the buffer itself rather than a copy of its bytes
+                    return send_file(
+                        pdf_buffer,
+                        mimetype='application/pdf',
+                        as_attachment=True,
+                        download_name=f'shift_report_{report_data["staff_name"]}_{report_data["week_start"]}.pdf'
                     )
-                    
-                    summary_text = f"""
-                    <br/><b>Period:</b> {report_data['week_start']} to {report_data['week_end']}<br/>
-                    <b>Total Shifts:</b> {report_data['total_shifts']}<br/>
-                    <b>Attended Shifts:</b> {report_data['attended_shifts']}<br/>
-                    <b>Attendance Rate:</b> {report_data['attendance_percentage']}%<br/>
-                    <b>Scheduled Hours:</b> {report_data['total_scheduled_hours']}<br/>
-                    <b>Actual Hours:</b> {report_data['total_actual_hours']}<br/>
-                    <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}<br/>
-                    """
-                    elements.append(Paragraph(summary_text, summary_style))
-                    elements.append(Spacer(1, 0.3*inch))
-                    
-                    # Shifts table
-                    table_data = [['Date', 'Start', 'End', 'Scheduled Hrs', 'Clock In', 'Clock Out', 'Actual Hrs', 'Attended']]
-                    for shift in report_data['shifts']:
-                        table_data.append([
-                            shift['date'],
-                            shift['start_time'],
-                            shift['end_time'],
-                            str(shift['scheduled_hours']),
-                            shift['clock_in'],
-                            shift['clock_out'],
-                            str(shift['actual_hours']),
-                            shift['attended']
-                        ])
-                    
-                    table = Table(table_data, colWidths=[0.9*inch, 0.75*inch, 0.75*inch, 0.85*inch, 0.75*inch, 0.75*inch, 0.75*inch, 0.7*inch])
-                    table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a2332')),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 10),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cccccc')),
-                        ('FONTSIZE', (0, 1), (-1, -1), 9),
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
-                    ]))
-                    elements.append(table)
-                    
-                    # Build PDF
-                    doc.build(elements)
-                    pdf_buffer.seek(0)
-                    
-                    response = make_response(pdf_buffer.read())
-                    response.headers['Content-Type'] = 'application/pdf'
-                    response.headers['Content-Disposition'] = f'attachment; filename="shift_report_{report_data["staff_name"]}_{report_data["week_start"]}.pdf"'
-                    return response
                 
             except ValueError as e:
                 flash(f'Invalid date format: {str(e)}', 'error')
@@ -633,57 +607,71 @@ def shift_report():
     return render_template('shift_report.html', staff_members=staff_members, report_data=report_data)
 
 @index_views.route('/admin/requests', methods=['GET', 'POST'])
-@admin_required
 def admin_requests():
-    from App.models import ShiftSwapRequest
-    
     if request.method == 'POST':
-        request_id = request.form.get('request_id')
-        action = request.form.get('action')  # approve or deny
-        
-        if request_id and action:
-            try:
-                swap_request = ShiftSwapRequest.query.get(int(request_id))
-                if not swap_request:
-                    flash('Request not found', 'error')
-                else:
-                    if action == 'approve':
-                        swap_request.status = 'approved'
-                        flash(f'Request from {swap_request.requesting_staff.username} has been approved', 'success')
-                    elif action == 'deny':
-                        swap_request.status = 'denied'
-                        flash(f'Request from {swap_request.requesting_staff.username} has been denied', 'error')
-                    
-                    db.session.commit()
-            except Exception as e:
-                flash(f'Error processing request: {str(e)}', 'error')
-        
-        return redirect(url_for('index_views.admin_requests'))
+        _review_swap_requests()
+        return redirect(url_for('.admin_requests'))
     
     # GET - Show all pending requests
-    pending_requests = ShiftSwapRequest.query.filter_by(status='pending').order_by(ShiftSwapRequest.created_at.desc()).all()
-    approved_requests = ShiftSwapRequest.query.filter_by(status='approved').order_by(ShiftSwapRequest.created_at.desc()).all()
-    denied_requests = ShiftSwapRequest.query.filter_by(status='denied').order_by(ShiftSwapRequest.created_at.desc()).all()
-    
-    return render_template('admin_requests.html', 
-                         pending_requests=pending_requests,
-                         approved_requests=approved_requests,
-                         denied_requests=denied_requests)
+    return render_template('admin_requests.html', **_swap_requests_by_status())
+
+_SWAP_STATUSES = ('pending', 'approved', 'denied')
+
+# Review action -> (new status, flash category)
+_REVIEW_ACTIONS = {'approve': ('approved', 'success'), 'deny': ('denied', 'error')}
+
+def _review_swap_requests():
+    """Approve or deny every submitted request_id with a single UPDATE."""
+    ids = [int(x) for x in request.form.getlist('request_id') if x.isdigit()]
+    review = _REVIEW_ACTIONS.get(request.form.get('action'))  # approve or deny
+    if not ids or not review:
+        return
+    status, category = review
+    try:
+        names = [name for _, name in db.session.query(ShiftSwapRequest.id, Staff.username).join(
+            Staff, Staff.id == ShiftSwapRequest.requesting_staff_id
+        ).filter(ShiftSwapRequest.id.in_(ids))]
+        if not names:
+            flash('Request not found', 'error')
+            return
+        ShiftSwapRequest.query.filter(ShiftSwapRequest.id.in_(ids)).update(
+            {ShiftSwapRequest.status: status}, synchronize_session=False
+        )
+        db.session.commit()
+        if len(names) == 1:
+            flash(f'Request from {names[0]} has been {status}', category)
+        else:
+            flash(f'{len(names)} requests have been {status}', category)
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Error processing request: {str(e)}', 'error')
+
+def _swap_requests_by_status():
+    """Fetch every swap request in one query and split it into the per-status template lists."""
+    rows = ShiftSwapRequest.query.options(
+        selectinload(ShiftSwapRequest.requesting_staff),
+        selectinload(ShiftSwapRequest.requested_staff),
+        selectinload(ShiftSwapRequest.shift),
+    ).filter(
+        ShiftSwapRequest.status.in_(_SWAP_STATUSES)
+    ).order_by(ShiftSwapRequest.created_at.desc()).all()
+
+    by_status = {f'{status}_requests': [] for status in _SWAP_STATUSES}
+    for row in rows:
+        by_status[f'{row.status}_requests'].append(row)
+    return by_status
 
 @index_views.route('/logout', methods=['GET'])
 def logout():
     session.clear()
     flash('You have been logged out successfully.', 'success')
-    return redirect(url_for('index_views.index_page'))
+    return redirect(url_for('.index_page'))
 
 @index_views.route('/admin/create-shift', methods=['GET', 'POST'])
-@admin_required
 def create_shift():
+    staff_members = get_staff_choices()
     if request.method == 'POST':
         try:
-            from datetime import datetime
-            from App.models import Shift
-            
             staff_id = request.form.get('staff_id')
             shift_date = request.form.get('shift_date')
             start_time_str = request.form.get('start_time')
@@ -691,8 +679,6 @@ def create_shift():
             
             if not all([staff_id, shift_date, start_time_str, end_time_str]):
                 flash('All fields are required.', 'error')
-                from App.models import Staff
-                staff_members = Staff.query.all()
                 return render_template('create_shift.html', staff_members=staff_members)
             
             # Combine date and time
@@ -701,8 +687,6 @@ def create_shift():
             
             if end_datetime <= start_datetime:
                 flash('End time must be after start time.', 'error')
-                from App.models import Staff
-                staff_members = Staff.query.all()
                 return render_template('create_shift.html', staff_members=staff_members)
             
             # Create the shift
@@ -711,33 +695,21 @@ def create_shift():
                 start_time=start_datetime,
                 end_time=end_datetime
             )
-            from App.database import db
             db.session.add(new_shift)
             db.session.commit()
             
             flash(f'Shift created successfully for staff member {staff_id}!', 'success')
-            from App.models import Staff
-            staff_members = Staff.query.all()
             return render_template('create_shift.html', staff_members=staff_members)
         
         except Exception as e:
             flash(f'Error creating shift: {str(e)}', 'error')
-            from App.models import Staff
-            staff_members = Staff.query.all()
             return render_template('create_shift.html', staff_members=staff_members)
     
     # GET request - show form
-    from App.models import Staff
-    staff_members = Staff.query.all()
     return render_template('create_shift.html', staff_members=staff_members)
 
 @index_views.route('/admin/create-schedule', methods=['GET', 'POST'])
-@admin_required
 def create_schedule():
-    from App.models import Schedule, Shift
-    from App.database import db
-    from datetime import datetime
-    
     if request.method == 'POST':
         try:
             # Support both form submissions and JSON payloads
@@ -790,24 +762,22 @@ def create_schedule():
             db.session.add(new_schedule)
             db.session.flush()  # Get the schedule ID without committing
             
-            # Assign selected shifts to schedule
-            if shift_ids:
-                for shift_id in shift_ids:
-                    try:
-                        shift = Shift.query.get(int(shift_id))
-                        if shift and shift.schedule_id is None:
-                            shift.schedule_id = new_schedule.id
-                    except (ValueError, TypeError):
-                        continue
+            # Assign the selected, still unscheduled shifts in a single UPDATE
+            ids = [int(x) for x in shift_ids if str(x).isdigit()]
+            assigned = 0
+            if ids:
+                assigned = Shift.query.filter(
+                    Shift.id.in_(ids), Shift.schedule_id.is_(None)
+                ).update({Shift.schedule_id: new_schedule.id}, synchronize_session=False)
             
             db.session.commit()
             
             if request.is_json:
                 return jsonify({'message': 'Schedule created', 'schedule': new_schedule.get_json()}), 201
 
-            flash(f'Schedule "{schedule_name}" created successfully with {len(shift_ids)} shifts!', 'success')
+            flash(f'Schedule "{schedule_name}" created successfully with {assigned} shifts!', 'success')
             return redirect(url_for(
-                'index_views.admin_roster',
+                '.admin_roster',
                 schedule_id=new_schedule.id,
                 week_start=start_date.date().isoformat()
             ))
@@ -826,13 +796,10 @@ def create_schedule():
     return render_template('create_schedule.html', available_shifts=available_shifts)
 
 @index_views.route('/admin/select-schedule', methods=['GET', 'POST'])
-@admin_required
 def select_schedule():
-    from App.models import Staff, Schedule
-    from App.controllers.schedule_controller import ScheduleController
-    from datetime import datetime, timedelta
-    
     if request.method == 'POST':
+        # select_strategy.html does not list staff, so every render passes an empty list
+        staff_members = []
         try:
             schedule_name = request.form.get('schedule_name', '').strip()
             week_start_str = request.form.get('week_start')
@@ -842,125 +809,86 @@ def select_schedule():
             
             if not all([schedule_name, week_start_str, week_end_str, strategy, admin_id]):
                 flash('All fields are required.', 'error')
-                staff_members = Staff.query.all()
                 return render_template('select_strategy.html', staff_members=staff_members)
             
-            # Parse dates
-            week_start = datetime.fromisoformat(week_start_str)
-            week_end = datetime.fromisoformat(week_end_str)
+            try:
+                week_start = datetime.fromisoformat(week_start_str)
+                week_end = datetime.fromisoformat(week_end_str)
+            except ValueError:
+                flash('Invalid start or end date.', 'error')
+                return render_template('select_strategy.html', staff_members=staff_members), 400
+            now = datetime.utcnow()
+            num_days = (week_end.date() - week_start.date()).days + 1
+            # Default shift hours: use start hour from week_start, default 8-hour shift
+            start_hour = week_start.hour or 9
             
             if week_end <= week_start:
                 flash('End date must be after start date.', 'error')
-                staff_members = Staff.query.all()
                 return render_template('select_strategy.html', staff_members=staff_members)
             
-            # Get all staff members
-            staff_members = Staff.query.all()
-            if not staff_members:
+            # Scheduling only needs the ids, so skip building Staff entities
+            eligible_staff_ids = [row[0] for row in db.session.query(Staff.id).order_by(Staff.id)]
+            if not eligible_staff_ids:
                 flash('No staff members available for scheduling.', 'error')
                 return render_template('select_strategy.html', staff_members=staff_members)
             
-            eligible_staff_ids = [s.id for s in staff_members]
-            
             # Create schedule
-            from App.database import db
             new_schedule = Schedule(
                 name=schedule_name,
                 created_by=admin_id,
                 admin_id=admin_id,
-                created_at=datetime.utcnow(),
+                created_at=now,
                 generation_method='auto',
                 strategy_used=strategy
             )
             db.session.add(new_schedule)
             db.session.flush()
             
-            # Calculate number of days
-            num_days = (week_end.date() - week_start.date()).days + 1
-            
-            # Default shift hours: use start hour from week_start, default 8-hour shift
-            shift_start_hour = week_start.hour if week_start.hour else 9
-            shift_end_hour = shift_start_hour + 8  # 8-hour shift by default
-            
             # Auto-populate schedule using the selected strategy
             result, status_code = ScheduleController.auto_populate_schedule(
                 schedule_id=new_schedule.id,
                 strategy_type=strategy,
                 eligible_staff_ids=eligible_staff_ids,
                 num_days=num_days,
-                shift_start_hour=shift_start_hour,
-                shift_end_hour=shift_end_hour,
+                shift_start_hour=start_hour,
+                shift_end_hour=start_hour + 8,
                 base_date=week_start
             )
             
             if status_code != 201:
                 db.session.rollback()
                 flash(f'Error generating schedule: {result.get("error", "Unknown error")}', 'error')
-                staff_members = Staff.query.all()
                 return render_template('select_strategy.html', staff_members=staff_members)
             
             db.session.commit()
             
             shifts_count = result.get('count', 0)
             flash(f'Schedule "{schedule_name}" created successfully with {shifts_count} auto-generated shifts using {strategy} strategy!', 'success')
-            staff_members = Staff.query.all()
             return render_template('select_strategy.html', staff_members=staff_members)
         
         except Exception as e:
             flash(f'Error creating schedule: {str(e)}', 'error')
-            staff_members = Staff.query.all()
             return render_template('select_strategy.html', staff_members=staff_members)
     
     # GET request - show form
-    staff_members = Staff.query.all()
-    return render_template('select_strategy.html', staff_members=staff_members)
+    return render_template('select_strategy.html', staff_members=[])
 
 @index_views.route('/admin/select-strategy', methods=['GET', 'POST'])
-@admin_required
 def select_strategy():
     # Later you can POST the chosen strategy and call your scheduler.
     if request.method == 'POST':
         chosen = request.form.get('strategy')
         # TODO: call your scheduler with this strategy
         flash(f'Selected strategy: {chosen}', 'success')
-        return redirect(url_for('index_views.admin_dashboard'))
+        return redirect(url_for('.admin_dashboard'))
 
     return render_template('select_strategy.html')
 
 @index_views.route('/admin/view-request', methods=['GET', 'POST'])
-@admin_required
 def view_requests():
-    from App.models import ShiftSwapRequest
-    
     if request.method == 'POST':
-        request_id = request.form.get('request_id')
-        action = request.form.get('action')  # approve or deny
-        
-        if request_id and action:
-            try:
-                swap_request = ShiftSwapRequest.query.get(int(request_id))
-                if not swap_request:
-                    flash('Request not found', 'error')
-                else:
-                    if action == 'approve':
-                        swap_request.status = 'approved'
-                        flash(f'Request from {swap_request.requesting_staff.username} has been approved', 'success')
-                    elif action == 'deny':
-                        swap_request.status = 'denied'
-                        flash(f'Request from {swap_request.requesting_staff.username} has been denied', 'error')
-                    
-                    db.session.commit()
-            except Exception as e:
-                flash(f'Error processing request: {str(e)}', 'error')
-        
-        return redirect(url_for('index_views.view_requests'))
+        _review_swap_requests()
+        return redirect(url_for('.view_requests'))
     
     # GET - Show all requests by status
-    pending_requests = ShiftSwapRequest.query.filter_by(status='pending').order_by(ShiftSwapRequest.created_at.desc()).all()
-    approved_requests = ShiftSwapRequest.query.filter_by(status='approved').order_by(ShiftSwapRequest.created_at.desc()).all()
-    denied_requests = ShiftSwapRequest.query.filter_by(status='denied').order_by(ShiftSwapRequest.created_at.desc()).all()
-    
-    return render_template('admin_requests.html', 
-                         pending_requests=pending_requests,
-                         approved_requests=approved_requests,
-                         denied_requests=denied_requests)
+    return render_template('admin_requests.html', **_swap_requests_by_status())
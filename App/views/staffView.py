@@ -1,10 +1,13 @@
 # app/views/staff_views.py
-from flask import Blueprint, jsonify, request, session, render_template, redirect, url_for, flash
-from App.controllers import staff, auth
+from flask import Blueprint, current_app, jsonify, request, session, render_template, redirect, url_for, flash
+from App.controllers import staff
+from App.models import Shift, ShiftSwapRequest, Staff
 from App.database import db
+from sqlalchemy import case, func
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
+from collections import Counter
 from functools import wraps
-from datetime import datetime, timedelta
 
 staff_views = Blueprint('staff_views', __name__, template_folder='../templates')
 
@@ -18,6 +21,14 @@ def staff_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def _swap_requests_query():
+    """Swap request query that loads the shift and both staff members get_json()/templates read."""
+    return ShiftSwapRequest.query.options(
+        selectinload(ShiftSwapRequest.shift),
+        selectinload(ShiftSwapRequest.requesting_staff),
+        selectinload(ShiftSwapRequest.requested_staff),
+    )
+
 # ============== API ROUTES ==============
 
 # Staff view roster route (API)
@@ -25,17 +36,23 @@ def staff_required(f):
 def view_roster():
     try:
         staff_id = request.args.get('staff_id', type=int)
-        roster = staff.get_combined_roster(staff_id)
-        return jsonify(roster), 200
+        body = staff.get_combined_roster_json(staff_id)
+        return current_app.response_class(body, mimetype='application/json'), 200
     except SQLAlchemyError:
         return jsonify({"error": "Database error"}), 500
 
 # Get shift details (API)
 @staff_views.route('/api/staff/shift', methods=['GET'])
 def view_shift():
+    shift_id = request.args.get('shift_id', type=int)
+    if shift_id is None:
+        # Existing clients send {"shiftID": ...} in the body, as clock_in/clock_out do
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            shift_id = data.get("shiftID")
+    if shift_id is None:
+        return jsonify({"error": "shift_id required"}), 400
     try:
-        data = request.get_json()
-        shift_id = data.get("shiftID")
         shift = staff.get_shift(shift_id)
         if not shift:
             return jsonify({"error": "Shift not found"}), 404
@@ -77,15 +94,13 @@ def clock_out():
 @staff_required
 def get_swap_requests():
     """Get all swap requests for the logged-in staff member."""
-    from App.models import ShiftSwapRequest
-    
     staff_id = session.get('user_id')
     
     # Get requests made by this staff member
-    made_requests = ShiftSwapRequest.query.filter_by(requesting_staff_id=staff_id).all()
+    made_requests = _swap_requests_query().filter_by(requesting_staff_id=staff_id).all()
     
     # Get requests received by this staff member
-    received_requests = ShiftSwapRequest.query.filter_by(requested_staff_id=staff_id).all()
+    received_requests = _swap_requests_query().filter_by(requested_staff_id=staff_id).all()
     
     return jsonify({
         'made_requests': [r.get_json() for r in made_requests],
@@ -96,8 +111,6 @@ def get_swap_requests():
 @staff_required
 def create_swap_request():
     """Create a new shift swap request."""
-    from App.models import ShiftSwapRequest, Shift
-    
     staff_id = session.get('user_id')
     data = request.get_json()
     
@@ -109,7 +122,7 @@ def create_swap_request():
         return jsonify({'error': 'Missing required fields'}), 400
     
     # Verify the shift belongs to the requesting staff
-    shift = Shift.query.get(shift_id)
+    shift = db.session.get(Shift, shift_id)
     if not shift or shift.staff_id != staff_id:
         return jsonify({'error': 'Invalid shift or not your shift'}), 400
     
@@ -125,7 +138,7 @@ def create_swap_request():
         db.session.commit()
         
         return jsonify({'message': 'Swap request created', 'request': new_request.get_json()}), 201
-    except Exception as e:
+    except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
@@ -133,8 +146,6 @@ def create_swap_request():
 @staff_required
 def respond_to_swap_request(request_id):
     """Respond to a received swap request (accept/decline)."""
-    from App.models import ShiftSwapRequest, Shift
-    
     staff_id = session.get('user_id')
     data = request.get_json()
     action = data.get('action')  # 'accept' or 'decline'
@@ -142,31 +153,18 @@ def respond_to_swap_request(request_id):
     if action not in ['accept', 'decline']:
         return jsonify({'error': 'Invalid action'}), 400
     
-    swap_request = ShiftSwapRequest.query.get(request_id)
-    if not swap_request:
-        return jsonify({'error': 'Request not found'}), 404
-    
-    if swap_request.requested_staff_id != staff_id:
-        return jsonify({'error': 'Not authorized to respond to this request'}), 403
-    
-    if swap_request.status != 'pending':
-        return jsonify({'error': 'Request already processed'}), 400
-    
     try:
-        if action == 'accept':
-            # Swap the shift assignment
-            shift = Shift.query.get(swap_request.shift_id)
-            if shift:
-                shift.staff_id = swap_request.requested_staff_id
-            swap_request.status = 'approved'
-        else:
-            swap_request.status = 'denied'
-        
-        db.session.commit()
-        return jsonify({'message': f'Request {action}ed', 'request': swap_request.get_json()}), 200
-    except Exception as e:
+        swap_request = staff.respond_to_swap(staff_id, request_id, action == 'accept')
+    except PermissionError as e:
+        return jsonify({'error': str(e)}), 403
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
+    if not swap_request:
+        return jsonify({'error': 'Request not found'}), 404
+    return jsonify({'message': f'Request {action}ed', 'request': swap_request.get_json()}), 200
 
 # ============== WEB PAGE ROUTES ==============
 
@@ -174,8 +172,6 @@ def respond_to_swap_request(request_id):
 @staff_required
 def staff_swap_requests():
     """View and manage swap requests."""
-    from App.models import ShiftSwapRequest, Shift, Staff
-    
     staff_id = session.get('user_id')
     
     if request.method == 'POST':
@@ -183,41 +179,35 @@ def staff_swap_requests():
         request_id = request.form.get('request_id')
         
         if request_id and action in ['accept', 'decline']:
-            swap_request = ShiftSwapRequest.query.get(int(request_id))
-            if swap_request and swap_request.requested_staff_id == staff_id:
-                try:
+            try:
+                if staff.respond_to_swap(staff_id, int(request_id), action == 'accept'):
                     if action == 'accept':
-                        shift = Shift.query.get(swap_request.shift_id)
-                        if shift:
-                            shift.staff_id = swap_request.requested_staff_id
-                        swap_request.status = 'approved'
                         flash('Swap request accepted! The shift has been assigned to you.', 'success')
                     else:
-                        swap_request.status = 'denied'
                         flash('Swap request declined.', 'error')
-                    db.session.commit()
-                except Exception as e:
-                    db.session.rollback()
-                    flash(f'Error processing request: {str(e)}', 'error')
+            except (PermissionError, ValueError) as e:
+                flash(str(e), 'error')
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                flash(f'Error processing request: {str(e)}', 'error')
         
-        return redirect(url_for('staff_views.staff_swap_requests'))
+        return redirect(url_for('.staff_swap_requests'))
     
     # GET - fetch swap requests
-    made_requests = ShiftSwapRequest.query.filter_by(requesting_staff_id=staff_id).order_by(ShiftSwapRequest.created_at.desc()).all()
-    received_requests = ShiftSwapRequest.query.filter_by(requested_staff_id=staff_id, status='pending').order_by(ShiftSwapRequest.created_at.desc()).all()
+    made_requests = _swap_requests_query().filter_by(requesting_staff_id=staff_id).order_by(ShiftSwapRequest.created_at.desc()).all()
+    received_requests = _swap_requests_query().filter_by(requested_staff_id=staff_id, status='pending').order_by(ShiftSwapRequest.created_at.desc()).all()
     
     return render_template('staff_swap_requests.html',
                          made_requests=made_requests,
+                         made_counts=Counter(r.status for r in made_requests),
                          received_requests=received_requests)
 
 @staff_views.route('/staff/profile', methods=['GET', 'POST'])
 @staff_required
 def staff_profile():
     """View and update staff profile."""
-    from App.models import Staff, Shift
-    
     staff_id = session.get('user_id')
-    staff_member = Staff.query.get(staff_id)
+    staff_member = db.session.get(Staff, staff_id)
     
     if request.method == 'POST':
         current_password = request.form.get('current_password', '').strip()
@@ -238,10 +228,12 @@ def staff_profile():
                     db.session.rollback()
                     flash(f'Error updating password: {str(e)}', 'error')
         
-        return redirect(url_for('staff_views.staff_profile'))
+        return redirect(url_for('.staff_profile'))
     
     # Get statistics
-    total_shifts = Shift.query.filter_by(staff_id=staff_id).count()
-    completed_shifts = Shift.query.filter(Shift.staff_id == staff_id, Shift.clock_out.isnot(None)).count()
+    total_shifts, completed_shifts = db.session.query(
+        func.count(Shift.id),
+        func.count(case((Shift.clock_out.isnot(None), 1)))
+    ).filter(Shift.staff_id == staff_id).one()
     
     return render_template('staff_profile.html', staff=staff_member, total_shifts=total_shifts, completed_shifts=completed_shifts)
\ No newline at end of file
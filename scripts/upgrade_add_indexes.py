@@ -0,0 +1,41 @@
+"""
+Run this script to create the indexes declared on the models in a
+database that was created before they were added. `db.create_all()` only
+creates indexes for new tables, so existing deployments need this once.
+
+Usage (from repository root):
+  python3 -m scripts.upgrade_add_indexes
+
+Every statement uses CREATE INDEX IF NOT EXISTS, so it is safe to re-run.
+"""
+import sys
+from sqlalchemy import text
+
+from App.main import create_app
+from App.database import db
+
+
+INDEXES = [
+    ("ix_shift_staff_start", "shift", "staff_id, start_time"),
+    ("ix_shift_schedule_start", "shift", "schedule_id, start_time"),
+    ("ix_schedule_generation_method", "schedule", "generation_method"),
+    ("ix_swap_requested_status_created", "shift_swap_request", "requested_staff_id, status, created_at"),
+    ("ix_swap_requesting_created", "shift_swap_request", "requesting_staff_id, created_at"),
+]
+
+
+def main():
+    create_app()
+    try:
+        with db.engine.begin() as conn:
+            for name, table, columns in INDEXES:
+                print(f"Ensuring index {name} on {table}({columns}) ...")
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+        print("Done.")
+    except Exception as e:
+        print("ERROR:", e)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()